@@ -0,0 +1,140 @@
+"""
+Tests for the fused lookup ID regex in api_diagnostic.py.
+
+LOOKUP_ID_PATTERN, extract_lookup_ids() and extract_lookup_ids_batch() must
+give the same results as searching CONTENT_ID_PATTERN and the docid patterns
+separately, which is how the IDs were originally extracted.
+
+Run from the repository root:
+    python -m unittest discover -s scripts/__tests__ -p "test_*.py"
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import api_diagnostic  # noqa: E402
+from api_diagnostic import (  # noqa: E402
+    CONTENT_ID_PATTERN,
+    DOCUMENT_ID_PATTERN,
+    DOCUMENT_ID_PATTERN_SIMPLE,
+    extract_lookup_ids,
+    extract_lookup_ids_batch,
+)
+
+
+def reference_lookup_ids(url):
+    """Extract lookup IDs with one search per original pattern."""
+    result = {}
+    if not url:
+        return result
+    match = CONTENT_ID_PATTERN.search(url)
+    if match:
+        result["contentId"] = match.group(0)
+    match = DOCUMENT_ID_PATTERN.search(url) or DOCUMENT_ID_PATTERN_SIMPLE.search(url)
+    if match:
+        result["documentId"] = match.group(1)
+    return result
+
+
+CASES = [
+    # (url, expected)
+    ("", {}),
+    ("https://example.com/page", {}),
+    (
+        "https://x.com/?Content_ID=TSRC-ABC-123456&docid=abc-123-def",
+        {"contentId": "TSRC-ABC-123456", "documentId": "abc-123-def"},
+    ),
+    # Overlapping: a Content ID inside a docid value is found by both
+    ("docid=TSRC-ABC-123456", {"contentId": "TSRC-ABC-123456", "documentId": "TSRC-ABC-123456"}),
+    ("TSRC-CMS-123456-654321", {"contentId": "TSRC-CMS-123456"}),
+    ("TSRC-A-1234567", {"contentId": "TSRC-A-123456"}),
+    ("TSRCMS-AB-123456", {"contentId": "CMS-AB-123456"}),
+    # The encoded docid wins even when the simple form comes first
+    ("docid=first&docid%3Dsecond", {"documentId": "second"}),
+    ("docid%3Ddocid=abc", {"documentId": "docid"}),
+    ("docid%3D=abc", {"documentId": "abc"}),
+    ("docid==abc", {}),
+    # Mixed case
+    ("tsrc-abc-123456", {"contentId": "tsrc-abc-123456"}),
+    ("Cms-XyZ-789012", {"contentId": "Cms-XyZ-789012"}),
+    ("DocID%3dXyZ-1", {"documentId": "XyZ-1"}),
+    ("DOCID=Abc", {"documentId": "Abc"}),
+    # Non-ASCII neighbours end a value and never count as ID characters
+    ("éTSRC-ABC-123456é", {"contentId": "TSRC-ABC-123456"}),
+    ("docid=abcédef", {"documentId": "abc"}),
+    ("docid=abK", {"documentId": "ab"}),
+    ("TSRC-ABC-12345٦", {}),
+    ("TSRC-ÅBC-123456", {}),
+    ("KTSRC-K-123456", {"contentId": "TSRC-K-123456"}),
+    # Values run to the end of the URL, including a trailing newline
+    ("docid=abc", {"documentId": "abc"}),
+    ("docid=abc\n", {"documentId": "abc"}),
+]
+
+FRAGMENTS = [
+    "TSRC-", "CMS-", "tsrc-", "cMs-", "docid", "DocId", "=", "%3D", "%3d", "%",
+    "3", "-", "&", "?", "/", "\n", "abc", "XYZ", "123456", "12345", "7", "0",
+    "é", "K", "٦", "Å", " ",
+]
+
+
+def random_url(rng):
+    return "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+
+
+class ExtractLookupIdsTest(unittest.TestCase):
+    def setUp(self):
+        api_diagnostic._scan_lookup_ids.cache_clear()
+
+    def test_known_cases(self):
+        for url, expected in CASES:
+            with self.subTest(url=url):
+                self.assertEqual(reference_lookup_ids(url), expected)
+                self.assertEqual(extract_lookup_ids(url), expected)
+
+    def test_matches_original_patterns(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            url = random_url(rng)
+            with self.subTest(url=url):
+                self.assertEqual(extract_lookup_ids(url), reference_lookup_ids(url))
+
+
+class ExtractLookupIdsBatchTest(unittest.TestCase):
+    def assert_batch_matches(self, urls):
+        self.assertEqual(
+            extract_lookup_ids_batch(urls),
+            [reference_lookup_ids(url) for url in urls],
+        )
+
+    def test_known_cases(self):
+        self.assert_batch_matches([url for url, _ in CASES])
+
+    def test_ids_do_not_span_url_boundaries(self):
+        # Joined, these would read "TSRC-ABC-123456" and "docid=abcdef"
+        self.assert_batch_matches(["TSRC-ABC-123", "456", "docid=abc", "def"])
+        self.assert_batch_matches(["docid", "=abc", "docid%3", "Dabc"])
+        self.assertEqual(extract_lookup_ids_batch(["TSRC-ABC-123", "456"]), [{}, {}])
+
+    def test_urls_containing_newlines(self):
+        self.assert_batch_matches(["a\ndocid=x\n", "\nTSRC-A-123456", "docid=y\n\n"])
+
+    def test_repeated_and_empty_urls(self):
+        urls = ["", "docid=abc", "", "docid=abc", "TSRC-ABC-123456"]
+        self.assert_batch_matches(urls)
+        self.assertEqual(extract_lookup_ids_batch([]), [])
+
+    def test_matches_original_patterns(self):
+        rng = random.Random(5678)
+        for _ in range(500):
+            urls = [random_url(rng) for _ in range(rng.randint(0, 20))]
+            with self.subTest(urls=urls):
+                self.assert_batch_matches(urls)
+
+
+if __name__ == "__main__":
+    unittest.main()
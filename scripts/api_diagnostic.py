@@ -15,6 +15,9 @@ Author: Documentation Hub Team
 
 import argparse
 import json
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import re
 import ssl
 import sys
@@ -22,7 +25,7 @@ import time
 import zipfile
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import unquote, urlparse
-from urllib.request import Request, urlopen
+from urllib.request import HTTPSHandler, OpenerDirector, Request, build_opener
 from urllib.error import URLError, HTTPError
 from xml.etree import ElementTree as ET
 
@@ -30,22 +33,47 @@ from xml.etree import ElementTree as ET
 # URL PATTERN EXTRACTION (matches urlPatterns.ts)
 # ============================================================================
 
+# All patterns use re.ASCII: relationship targets are ASCII per OOXML, and
+# like the JavaScript originals, \d and case-folding stay in the ASCII range
+# (without it, \d also matches e.g. Arabic-Indic digits and 'K' matches the
+# Kelvin sign). It also keeps the matcher on its cheaper ASCII path.
+
 # Content ID pattern: TSRC-ABC-123456 or CMS-XYZ-789012
-CONTENT_ID_PATTERN = re.compile(r'(TSRC|CMS)-([a-zA-Z0-9]+)-(\d{6})', re.IGNORECASE)
+CONTENT_ID_PATTERN = re.compile(r'(TSRC|CMS)-([a-zA-Z0-9]+)-(\d{6})', re.IGNORECASE | re.ASCII)
 
 # Document ID pattern: docid=abc-123-def or docid=abc123
 # Also matches URL-encoded versions: docid%3D or docid%3d
-DOCUMENT_ID_PATTERN = re.compile(r'docid[=%]3[dD]=?([a-zA-Z0-9-]+)(?:[^a-zA-Z0-9-]|$)', re.IGNORECASE)
+DOCUMENT_ID_PATTERN = re.compile(r'docid[=%]3[dD]=?([a-zA-Z0-9-]+)(?:[^a-zA-Z0-9-]|$)', re.IGNORECASE | re.ASCII)
 
 # Alternative pattern for docid without encoding
-DOCUMENT_ID_PATTERN_SIMPLE = re.compile(r'docid=([a-zA-Z0-9-]+)(?:[^a-zA-Z0-9-]|$)', re.IGNORECASE)
+DOCUMENT_ID_PATTERN_SIMPLE = re.compile(r'docid=([a-zA-Z0-9-]+)(?:[^a-zA-Z0-9-]|$)', re.IGNORECASE | re.ASCII)
+
+# All three patterns fused into one alternation so a single scan finds every
+# candidate. The branches sit inside a lookahead so no match consumes text:
+# a Content ID inside a docid value is still found, exactly as if each
+# pattern were searched separately. The leading character class lets the
+# regex engine skip positions that cannot start any branch.
+LOOKUP_ID_PATTERN = re.compile(
+    r'(?=[CDTcdt])'
+    r'(?=(?P<cid>(?:TSRC|CMS)-[a-zA-Z0-9]+-\d{6})'
+    r'|docid(?:[=%]3[dD]=?(?P<edid>[a-zA-Z0-9-]+)(?:[^a-zA-Z0-9-]|$)'
+    r'|=(?P<did>[a-zA-Z0-9-]+)(?:[^a-zA-Z0-9-]|$)))',
+    re.IGNORECASE | re.ASCII
+)
+
+# Bound search methods, looked up once rather than on every URL
+_content_id_search = CONTENT_ID_PATTERN.search
+_document_id_search = DOCUMENT_ID_PATTERN.search
+_document_id_simple_search = DOCUMENT_ID_PATTERN_SIMPLE.search
+_lookup_id_finditer = LOOKUP_ID_PATTERN.finditer
+_LOOKUP_GROUP_INDEX = {'cid': 0, 'edid': 1, 'did': 2}
 
 
 def extract_content_id(url: str) -> Optional[str]:
     """Extract Content ID from URL (e.g., TSRC-ABC-123456)."""
     if not url:
         return None
-    match = CONTENT_ID_PATTERN.search(url)
+    match = _content_id_search(url)
     return match.group(0) if match else None
 
 
@@ -59,23 +87,82 @@ def extract_document_id(url: str) -> Optional[str]:
     if not url:
         return None
 
-    # Try URL-encoded pattern first
-    match = DOCUMENT_ID_PATTERN.search(url)
-    if match:
-        return match.group(1)
-
-    # Try simple pattern
-    match = DOCUMENT_ID_PATTERN_SIMPLE.search(url)
+    # URL-encoded pattern takes precedence over the simple one
+    match = _document_id_search(url) or _document_id_simple_search(url)
     return match.group(1) if match else None
 
 
 def extract_lookup_ids(url: str) -> Dict[str, str]:
     """Extract both Content ID and Document ID from URL."""
+    if not url:
+        return {}
+    return _build_lookup_ids(*_scan_lookup_ids(url))
+
+
+@lru_cache(maxsize=4096)
+def _scan_lookup_ids(url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Return the first content ID, encoded docid and simple docid in url.
+
+    Memoized because the same URL or display text is often repeated across
+    a document's hyperlinks (TOCs, cross-references).
+    """
+    # One pass over the URL; the first match of each kind wins
+    content_id = encoded_doc_id = doc_id = None
+    for match in _lookup_id_finditer(url):
+        group = match.lastgroup
+        if group == 'cid':
+            if content_id is None:
+                content_id = match.group(group)
+        elif group == 'edid':
+            if encoded_doc_id is None:
+                encoded_doc_id = match.group(group)
+        elif doc_id is None:
+            doc_id = match.group(group)
+
+        if content_id is not None and encoded_doc_id is not None:
+            break
+
+    return content_id, encoded_doc_id, doc_id
+
+
+def extract_lookup_ids_batch(urls: List[str]) -> List[Dict[str, str]]:
+    """Extract lookup IDs for many URLs with a single regex scan.
+
+    The URLs are joined with newlines, which no ID pattern can match
+    across, and each match is mapped back to its URL by offset. Results
+    are identical to calling extract_lookup_ids() on each URL. Repeated
+    URLs are scanned once.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    starts = []
+    offset = 0
+    for url in unique_urls:
+        starts.append(offset)
+        offset += len(url) + 1
+
+    # Per URL: [content ID, encoded docid, simple docid]
+    found = [[None, None, None] for _ in unique_urls]
+    for match in _lookup_id_finditer('\n'.join(unique_urls)):
+        group = match.lastgroup
+        slot = found[bisect_right(starts, match.start()) - 1]
+        index = _LOOKUP_GROUP_INDEX[group]
+        if slot[index] is None:
+            slot[index] = match.group(group)
+
+    by_url = dict(zip(unique_urls, found))
+    return [_build_lookup_ids(*by_url[url]) for url in urls]
+
+
+def _build_lookup_ids(
+    content_id: Optional[str],
+    encoded_doc_id: Optional[str],
+    doc_id: Optional[str]
+) -> Dict[str, str]:
+    """Assemble the lookup ID dict from the first match of each kind."""
     result = {}
-    content_id = extract_content_id(url)
     if content_id:
         result['contentId'] = content_id
-    document_id = extract_document_id(url)
+    document_id = encoded_doc_id or doc_id
     if document_id:
         result['documentId'] = document_id
     return result
@@ -91,6 +178,90 @@ NAMESPACES = {
     'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
 }
 
+# Clark-notation names, built once instead of per element
+HYPERLINK_TAG = f'{{{NAMESPACES["w"]}}}hyperlink'
+T_TAG = f'{{{NAMESPACES["w"]}}}t'
+R_ID_ATTR = f'{{{NAMESPACES["r"]}}}id'
+W_ANCHOR_ATTR = f'{{{NAMESPACES["w"]}}}anchor'
+RELATIONSHIP_TAG = f'{{{NAMESPACES["rel"]}}}Relationship'
+
+# Relationship Type URIs for hyperlinks (Transitional and Strict OOXML)
+HYPERLINK_REL_TYPES = frozenset({
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink',
+    'http://purl.oclc.org/ooxml/officeDocument/relationships/hyperlink',
+})
+
+
+def _iter_hyperlink_elements(source):
+    """Incrementally parse document.xml, yielding each completed hyperlink element.
+
+    Body children are discarded once fully parsed, so peak memory is bounded
+    by the largest top-level block rather than the whole document.
+    """
+    depth = 0
+    body = None
+
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if depth == 2:
+                body = elem
+            continue
+
+        depth -= 1
+        if elem.tag == HYPERLINK_TAG:
+            yield elem
+        elif depth == 2 and body is not None:
+            # A top-level block (paragraph, table, ...) is complete; every
+            # hyperlink inside it has already been yielded.
+            body.clear()
+
+
+# Stand-in for an rId with no hyperlink relationship: no URL, IDs unknown
+_NO_RELATIONSHIP = ('', '', None)
+
+
+def _parse_relationships(filepath: str) -> Dict[str, Tuple[str, str, Dict[str, str]]]:
+    """Map hyperlink relationship IDs to (raw target, decoded target, lookup IDs).
+
+    Opens its own handle on the DOCX so it can run alongside the
+    document.xml parse; ZipFile objects are not safe to share across threads.
+    """
+    rels_map = {}
+
+    with zipfile.ZipFile(filepath, 'r') as zf:
+        # Look the member up directly rather than building and scanning
+        # the full name list
+        try:
+            rels_info = zf.getinfo('word/_rels/document.xml.rels')
+        except KeyError:
+            return rels_map
+
+        with zf.open(rels_info) as f:
+            # Parse straight from the member stream so inflating and
+            # parsing overlap and no intermediate buffer is kept
+            for _, rel in ET.iterparse(f):
+                if rel.tag != RELATIONSHIP_TAG:
+                    continue
+
+                rel_id = rel.get('Id', '')
+                target = rel.get('Target', '')
+                rel_type = rel.get('Type', '')
+
+                if rel_type in HYPERLINK_REL_TYPES:
+                    # URL-decode the target
+                    rels_map[rel_id] = (target, unquote(target))
+                rel.clear()
+
+    # Scan every hyperlink target once, up front. Hyperlinks pointing
+    # straight at a target reuse these IDs instead of rescanning the same
+    # URL per hyperlink.
+    rel_lookup_ids = extract_lookup_ids_batch([decoded for _, decoded in rels_map.values()])
+    return {
+        rel_id: (raw, decoded, lookup_ids)
+        for (rel_id, (raw, decoded)), lookup_ids in zip(rels_map.items(), rel_lookup_ids)
+    }
+
 
 def extract_hyperlinks_from_docx(filepath: str) -> List[Dict[str, Any]]:
     """Extract all hyperlinks from a DOCX file.
@@ -100,97 +271,93 @@ def extract_hyperlinks_from_docx(filepath: str) -> List[Dict[str, Any]]:
     - Fragment identifiers stored separately as anchors
     - URLs with hashbang (#!) routing
     """
-    hyperlinks = []
+    # Memoized scans only pay off within one document; start fresh so the
+    # cache does not hold URLs from earlier files
+    _scan_lookup_ids.cache_clear()
 
-    try:
-        with zipfile.ZipFile(filepath, 'r') as zf:
-            # First, get the relationships to map rId to URLs
+    # (rId, anchor, display text) per hyperlink, resolved once the
+    # relationships are available
+    links = []
+    error = None
+
+    # The relationships part is independent of document.xml until URLs are
+    # resolved, so inflate and parse it on a worker thread meanwhile
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        rels_future = executor.submit(_parse_relationships, filepath)
+
+        try:
+            with zipfile.ZipFile(filepath, 'r') as zf:
+                with zf.open('word/document.xml') as f:
+                    for hl in _iter_hyperlink_elements(f):
+                        # Get display text (w:t only; itertext() would also
+                        # pick up deleted text and field instructions)
+                        display_text = ''.join([t.text for t in hl.iter(T_TAG) if t.text])
+                        links.append((hl.get(R_ID_ATTR, ''), hl.get(W_ANCHOR_ATTR, ''), display_text))
+        except Exception as e:
+            error = e
+
+        try:
+            rels_map = rels_future.result()
+        except Exception as e:
+            # Without relationships nothing can be resolved; report this
+            # error, as it is the part that is read first
             rels_map = {}
-            rels_path = 'word/_rels/document.xml.rels'
-
-            if rels_path in zf.namelist():
-                with zf.open(rels_path) as f:
-                    rels_content = f.read()
-                    rels_root = ET.fromstring(rels_content)
-
-                    rel_ns = 'http://schemas.openxmlformats.org/package/2006/relationships'
-                    for rel in rels_root.findall(f'.//{{{rel_ns}}}Relationship'):
-                        rel_id = rel.get('Id', '')
-                        target = rel.get('Target', '')
-                        rel_type = rel.get('Type', '')
-
-                        if 'hyperlink' in rel_type.lower():
-                            # URL-decode the target
-                            decoded_target = unquote(target)
-                            rels_map[rel_id] = {
-                                'raw': target,
-                                'decoded': decoded_target
-                            }
-
-            # Now parse document.xml for hyperlinks
-            with zf.open('word/document.xml') as f:
-                doc_content = f.read()
-                root = ET.fromstring(doc_content)
-
-                w_ns = NAMESPACES['w']
-                r_ns = NAMESPACES['r']
-
-                for hl in root.findall(f'.//{{{w_ns}}}hyperlink'):
-                    r_id = hl.get(f'{{{r_ns}}}id', '')
-                    anchor = hl.get(f'{{{w_ns}}}anchor', '')
-
-                    # Get display text
-                    text_parts = []
-                    for t in hl.findall(f'.//{{{w_ns}}}t'):
-                        if t.text:
-                            text_parts.append(t.text)
-                    display_text = ''.join(text_parts)
-
-                    # Get URL from relationships
-                    rel_info = rels_map.get(r_id, {})
-                    raw_url = rel_info.get('raw', '') if isinstance(rel_info, dict) else rel_info
-                    url = rel_info.get('decoded', raw_url) if isinstance(rel_info, dict) else rel_info
-
-                    # Combine URL with anchor if both exist
-                    # Word sometimes stores fragment (after #) separately as anchor
-                    full_url = url
-                    if url and anchor:
-                        # Check if URL already has a fragment
-                        if '#' not in url:
-                            full_url = f"{url}#{anchor}"
-                        else:
-                            full_url = url  # Already has fragment
-                    elif anchor and not url:
-                        full_url = f"#{anchor}"  # Internal bookmark
-
-                    if full_url or anchor:
-                        hyperlink_info = {
-                            'url': full_url,
-                            'rawUrl': raw_url,  # Keep original for debugging
-                            'displayText': display_text,
-                            'relationshipId': r_id,
-                            'anchor': anchor,
-                            'isInternal': bool(anchor and not url),
-                        }
-
-                        # Extract lookup IDs from full URL
-                        lookup_ids = extract_lookup_ids(full_url)
-
-                        # Also try extracting from raw URL in case decoding changed something
-                        if not lookup_ids and raw_url:
-                            lookup_ids = extract_lookup_ids(raw_url)
-
-                        # Also try the display text - sometimes the ID is visible there
-                        if not lookup_ids and display_text:
-                            lookup_ids = extract_lookup_ids(display_text)
-
-                        if lookup_ids:
-                            hyperlink_info['lookupIds'] = lookup_ids
-
-                        hyperlinks.append(hyperlink_info)
+            links = []
+            error = e
 
-    except Exception as e:
-        print(f"Error extracting hyperlinks: {e}", file=sys.stderr)
+    hyperlinks = []
+    # Lookup IDs already known for each hyperlink (None until scanned)
+    known_lookup_ids: List[Optional[Dict[str, str]]] = []
+
+    for r_id, anchor, display_text in links:
+        # Get URL from relationships
+        raw_url, url, rel_lookup_ids = rels_map.get(r_id, _NO_RELATIONSHIP)
+
+        # Combine URL with anchor if both exist
+        # Word sometimes stores fragment (after #) separately as anchor
+        full_url = url
+        if url and anchor:
+            # Check if URL already has a fragment
+            if '#' not in url:
+                full_url = f"{url}#{anchor}"
+            else:
+                full_url = url  # Already has fragment
+        elif anchor and not url:
+            full_url = f"#{anchor}"  # Internal bookmark
+
+        if full_url or anchor:
+            hyperlink_info = {
+                'url': full_url,
+                'rawUrl': raw_url,  # Keep original for debugging
+                'displayText': display_text,
+                'relationshipId': r_id,
+                'anchor': anchor,
+                'isInternal': bool(anchor and not url),
+            }
+            hyperlinks.append(hyperlink_info)
+            known_lookup_ids.append(rel_lookup_ids if full_url == url else None)
+
+    if error is not None:
+        print(f"Error extracting hyperlinks: {error}", file=sys.stderr)
+
+    # URLs that differ from their relationship target (anchor appended,
+    # internal bookmarks) are scanned together in one pass
+    pending = [i for i, lookup_ids in enumerate(known_lookup_ids) if lookup_ids is None]
+    pending_lookup_ids = extract_lookup_ids_batch([hyperlinks[i]['url'] for i in pending])
+    for i, lookup_ids in zip(pending, pending_lookup_ids):
+        known_lookup_ids[i] = lookup_ids
+
+    for hyperlink_info, lookup_ids in zip(hyperlinks, known_lookup_ids):
+        # Also try extracting from raw URL in case decoding changed something
+        if not lookup_ids and hyperlink_info['rawUrl']:
+            lookup_ids = extract_lookup_ids(hyperlink_info['rawUrl'])
+
+        # Also try the display text - sometimes the ID is visible there
+        if not lookup_ids and hyperlink_info['displayText']:
+            lookup_ids = extract_lookup_ids(hyperlink_info['displayText'])
+
+        if lookup_ids:
+            hyperlink_info['lookupIds'] = lookup_ids
 
     return hyperlinks
 
@@ -214,6 +381,63 @@ class Colors:
         cls.RED = cls.GREEN = cls.YELLOW = cls.BLUE = cls.CYAN = cls.BOLD = cls.RESET = ''
 
 
+def colorize(text: Any, color: str) -> str:
+    """Wrap text in a color code, or return it bare when colors are disabled."""
+    if not Colors.RESET:
+        return str(text)
+    return f'{color}{text}{Colors.RESET}'
+
+
+# Reused for all pretty-printed output; json.dumps(indent=...) builds a
+# fresh encoder on every call
+_pretty_json = json.JSONEncoder(indent=2)
+
+
+def json_preview(data: Any, limit: int) -> str:
+    """Pretty-print data as JSON, stopping once limit characters are produced."""
+    parts = []
+    size = 0
+    for chunk in _pretty_json.iterencode(data):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return ''.join(parts)[:limit]
+
+
+# Request headers are identical for every call; Request copies them, so the
+# shared dict is never mutated
+_BASE_HEADERS = {
+    'Content-Type': 'application/json; charset=utf-8',
+    'User-Agent': 'DocHub-Diagnostic/1.0',
+}
+
+# Response bodies larger than this are summarised rather than kept whole in
+# the result unless --verbose is given
+LARGE_RESPONSE_BYTES = 1024 * 1024
+
+# Response headers kept in the result; the rest are never reported
+REPORTED_HEADERS = ('Content-Type', 'Content-Length', 'Server')
+
+# Openers are cached per verification mode so repeated calls (e.g. one per
+# batch of IDs) reuse the handler chain and SSL context instead of rebuilding
+# them and reloading the CA store every time
+_openers: Dict[bool, OpenerDirector] = {}
+
+
+def _get_opener(insecure: bool) -> OpenerDirector:
+    """Return the shared opener for the given SSL verification mode."""
+    opener = _openers.get(insecure)
+    if opener is None:
+        ssl_context = ssl.create_default_context()
+        if insecure:
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        opener = build_opener(HTTPSHandler(context=ssl_context))
+        _openers[insecure] = opener
+    return opener
+
+
 def test_api_connection(
     api_url: str,
     lookup_ids: List[str],
@@ -257,50 +481,53 @@ def test_api_connection(
     }
 
     # Prepare request
-    headers = {
-        'Content-Type': 'application/json; charset=utf-8',
-        'User-Agent': 'DocHub-Diagnostic/1.0',
-    }
-
     json_payload = json.dumps(payload).encode('utf-8')
 
     if verbose:
-        print(f"\n{Colors.CYAN}Request Payload:{Colors.RESET}")
-        print(json.dumps(payload, indent=2))
+        print(f"\n{colorize('Request Payload:', Colors.CYAN)}")
+        print(_pretty_json.encode(payload))
 
-    # Make request
-    start_time = time.time()
-
-    # Create SSL context
-    ssl_context = None
+    opener = _get_opener(insecure)
     if insecure:
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
         result['warnings'].append('SSL certificate verification disabled (--insecure flag)')
 
+    # Make request
+    start_time = time.time()
+
     try:
-        req = Request(api_url, data=json_payload, headers=headers, method='POST')
+        req = Request(api_url, data=json_payload, headers=_BASE_HEADERS, method='POST')
 
-        with urlopen(req, timeout=timeout, context=ssl_context) as response:
+        with opener.open(req, timeout=timeout) as response:
             elapsed = time.time() - start_time
             result['timing']['elapsed_ms'] = round(elapsed * 1000, 2)
 
             status_code = response.getcode()
-            response_headers = dict(response.headers)
-            response_body = response.read().decode('utf-8')
+            response_headers = {}
+            for name in REPORTED_HEADERS:
+                value = response.headers.get(name)
+                if value is not None:
+                    response_headers[name] = value
+            # json.loads accepts bytes directly, so the body is only decoded
+            # to str when it has to be shown as raw text
+            raw_body = response.read()
 
             result['response'] = {
                 'status_code': status_code,
                 'headers': response_headers,
-                'body_length': len(response_body),
+                'body_length': len(raw_body),
             }
 
             # Try to parse JSON
             try:
-                response_data = json.loads(response_body)
+                response_data = json.loads(raw_body)
                 result['response']['parsed'] = True
-                result['response']['data'] = response_data
+                # Large bodies are only summarised (count and sample fields
+                # below) so the parsed Results can be freed straight away
+                # instead of being carried through to the JSON report
+                if verbose or len(raw_body) <= LARGE_RESPONSE_BYTES:
+                    result['response']['data'] = response_data
+                else:
+                    result['response']['data_omitted'] = True
 
                 # Check for expected structure
                 if 'Results' in response_data:
@@ -323,9 +550,9 @@ def test_api_connection(
                 else:
                     result['warnings'].append(f"No 'Results' key in response. Keys found: {list(response_data.keys())}")
 
-            except json.JSONDecodeError as e:
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
                 result['response']['parsed'] = False
-                result['response']['raw_body'] = response_body[:1000]
+                result['response']['raw_body'] = raw_body[:1000].decode('utf-8', errors='replace')
                 result['errors'].append(f"Failed to parse JSON: {e}")
 
     except HTTPError as e:
@@ -362,14 +589,17 @@ def test_api_connection(
     return result
 
 
+RULE = '=' * 70
+
+
 def print_diagnostic_report(result: Dict[str, Any], verbose: bool = False):
     """Print formatted diagnostic report."""
-    print(f"\n{Colors.BOLD}{'=' * 70}{Colors.RESET}")
-    print(f"{Colors.BOLD}PowerAutomate API Diagnostic Report{Colors.RESET}")
-    print(f"{Colors.BOLD}{'=' * 70}{Colors.RESET}")
+    print(f"\n{colorize(RULE, Colors.BOLD)}")
+    print(colorize('PowerAutomate API Diagnostic Report', Colors.BOLD))
+    print(colorize(RULE, Colors.BOLD))
 
     # Request info
-    print(f"\n{Colors.BOLD}[Request]{Colors.RESET}")
+    print(f"\n{colorize('[Request]', Colors.BOLD)}")
     print(f"  URL: {result['request'].get('url', 'N/A')}")
     print(f"  Method: {result['request'].get('method', 'N/A')}")
     print(f"  Timeout: {result['request'].get('timeout', 'N/A')}s")
@@ -382,66 +612,66 @@ def print_diagnostic_report(result: Dict[str, Any], verbose: bool = False):
 
     # Timing
     if result['timing']:
-        print(f"\n{Colors.BOLD}[Timing]{Colors.RESET}")
+        print(f"\n{colorize('[Timing]', Colors.BOLD)}")
         print(f"  Elapsed: {result['timing'].get('elapsed_ms', 'N/A')} ms")
 
     # Response info
-    print(f"\n{Colors.BOLD}[Response]{Colors.RESET}")
+    print(f"\n{colorize('[Response]', Colors.BOLD)}")
     response = result.get('response', {})
 
     status_code = response.get('status_code')
     if status_code:
         color = Colors.GREEN if 200 <= status_code < 300 else Colors.RED
-        print(f"  Status: {color}{status_code}{Colors.RESET}")
+        print(f"  Status: {colorize(status_code, color)}")
 
     if response.get('reason'):
         print(f"  Reason: {response['reason']}")
 
     if response.get('parsed'):
-        print(f"  JSON Parsed: {Colors.GREEN}Yes{Colors.RESET}")
+        print(f"  JSON Parsed: {colorize('Yes', Colors.GREEN)}")
         print(f"  Body Length: {response.get('body_length', 'N/A')} bytes")
 
         if 'results_count' in response:
-            print(f"  Results Count: {Colors.GREEN}{response['results_count']}{Colors.RESET}")
+            print(f"  Results Count: {colorize(response['results_count'], Colors.GREEN)}")
 
         if 'result_fields' in response:
             print(f"  Result Fields: {', '.join(response['result_fields'])}")
 
         if verbose and 'data' in response:
-            print(f"\n{Colors.CYAN}Response Data:{Colors.RESET}")
-            print(json.dumps(response['data'], indent=2)[:2000])
+            print(f"\n{colorize('Response Data:', Colors.CYAN)}")
+            print(json_preview(response['data'], 2000))
     else:
-        print(f"  JSON Parsed: {Colors.RED}No{Colors.RESET}")
+        print(f"  JSON Parsed: {colorize('No', Colors.RED)}")
         if 'raw_body' in response:
-            print(f"\n{Colors.CYAN}Raw Response (first 500 chars):{Colors.RESET}")
+            print(f"\n{colorize('Raw Response (first 500 chars):', Colors.CYAN)}")
             print(response['raw_body'][:500])
 
     if response.get('error_body'):
-        print(f"\n{Colors.CYAN}Error Body:{Colors.RESET}")
+        print(f"\n{colorize('Error Body:', Colors.CYAN)}")
         print(response['error_body'][:500])
 
     # Warnings
     if result['warnings']:
-        print(f"\n{Colors.BOLD}[Warnings]{Colors.RESET}")
+        print(f"\n{colorize('[Warnings]', Colors.BOLD)}")
         for warning in result['warnings']:
-            print(f"  {Colors.YELLOW}! {warning}{Colors.RESET}")
+            print(f"  {colorize('! ' + warning, Colors.YELLOW)}")
 
     # Errors
     if result['errors']:
-        print(f"\n{Colors.BOLD}[Errors]{Colors.RESET}")
+        print(f"\n{colorize('[Errors]', Colors.BOLD)}")
         for error in result['errors']:
-            print(f"  {Colors.RED}X {error}{Colors.RESET}")
+            print(f"  {colorize('X ' + error, Colors.RED)}")
 
     # Summary
-    print(f"\n{Colors.BOLD}{'=' * 70}{Colors.RESET}")
+    print(f"\n{colorize(RULE, Colors.BOLD)}")
     if result['success']:
-        print(f"Status: {Colors.GREEN}{Colors.BOLD}SUCCESS{Colors.RESET}")
+        print(f"Status: {colorize('SUCCESS', Colors.GREEN + Colors.BOLD)}")
         print("The API returned a valid response with Results array.")
     else:
-        print(f"Status: {Colors.RED}{Colors.BOLD}FAILED{Colors.RESET}")
+        print(f"Status: {colorize('FAILED', Colors.RED + Colors.BOLD)}")
         if result['errors']:
             print(f"Primary Error: {result['errors'][0]}")
-    print(f"{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
+    print(colorize(RULE, Colors.BOLD) + "\n")
 
 
 def main():
@@ -516,7 +746,7 @@ Config file format (JSON):
 
     # Extract from DOCX if provided
     if args.docx:
-        print(f"\n{Colors.BOLD}Extracting hyperlinks from: {args.docx}{Colors.RESET}")
+        print(f"\n{colorize('Extracting hyperlinks from: ' + args.docx, Colors.BOLD)}")
         hyperlinks = extract_hyperlinks_from_docx(args.docx)
 
         print(f"\nFound {len(hyperlinks)} hyperlinks:")
@@ -553,13 +783,13 @@ Config file format (JSON):
                 print(f"    IDs: {id_str}")
                 print()
 
-        print(f"\n{Colors.BOLD}Summary:{Colors.RESET}")
+        print(f"\n{colorize('Summary:', Colors.BOLD)}")
         print(f"  Internal hyperlinks: {internal_count}")
         print(f"  External hyperlinks: {external_count}")
         print(f"  Unique Lookup IDs: {len(docx_ids)}")
 
         if docx_ids:
-            print(f"\n{Colors.BOLD}Extracted Lookup_ID array:{Colors.RESET}")
+            print(f"\n{colorize('Extracted Lookup_ID array:', Colors.BOLD)}")
             for id in sorted(docx_ids):
                 print(f"  - {id}")
 
@@ -600,9 +830,9 @@ Config file format (JSON):
     timeout = args.timeout or config.get('timeout', 30)
 
     # Run diagnostic
-    print(f"\n{Colors.BOLD}Testing API connection...{Colors.RESET}")
+    print(f"\n{colorize('Testing API connection...', Colors.BOLD)}")
     if args.insecure:
-        print(f"{Colors.YELLOW}WARNING: SSL certificate verification disabled{Colors.RESET}")
+        print(colorize('WARNING: SSL certificate verification disabled', Colors.YELLOW))
     result = test_api_connection(
         api_url=api_url,
         lookup_ids=lookup_ids,
@@ -16,13 +16,19 @@ Author: Documentation Hub Team
 """
 
 import argparse
-import json
+import codecs
+import fnmatch
+import glob
+import io
+import mmap
 import os
 import re
 import sys
 import zipfile
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from contextlib import redirect_stdout
+from itertools import islice, repeat
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
 from xml.etree import ElementTree as ET
 
 # OpenXML namespaces
@@ -42,6 +48,25 @@ NAMESPACES = {
 for prefix, uri in NAMESPACES.items():
     ET.register_namespace(prefix, uri)
 
+# Clark-notation names, built once instead of per check or per element
+INS_TAG = f'{{{NAMESPACES["w"]}}}ins'
+DEL_TAG = f'{{{NAMESPACES["w"]}}}del'
+PPR_CHANGE_TAG = f'{{{NAMESPACES["w"]}}}pPrChange'
+RPR_CHANGE_TAG = f'{{{NAMESPACES["w"]}}}rPrChange'
+SMART_TAG_TAG = f'{{{NAMESPACES["w"]}}}smartTag'
+SDT_TAG = f'{{{NAMESPACES["w"]}}}sdt'
+SDT_PR_TAG = f'{{{NAMESPACES["w"]}}}sdtPr'
+LOCK_TAG = f'{{{NAMESPACES["w"]}}}lock'
+FLD_CHAR_TAG = f'{{{NAMESPACES["w"]}}}fldChar'
+INSTR_TEXT_TAG = f'{{{NAMESPACES["w"]}}}instrText'
+HYPERLINK_TAG = f'{{{NAMESPACES["w"]}}}hyperlink'
+OMATH_TAG = f'{{{NAMESPACES["m"]}}}oMath'
+OMATH_PARA_TAG = f'{{{NAMESPACES["m"]}}}oMathPara'
+RELATIONSHIP_TAG = f'{{{NAMESPACES["rel"]}}}Relationship'
+W_VAL_ATTR = f'{{{NAMESPACES["w"]}}}val'
+W_ANCHOR_ATTR = f'{{{NAMESPACES["w"]}}}anchor'
+R_ID_ATTR = f'{{{NAMESPACES["r"]}}}id'
+
 
 class Severity:
     """Issue severity levels."""
@@ -60,6 +85,10 @@ class Colors:
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
+    # Resolved once here and in disable(), so formatting just looks them up
+    SEVERITY = {Severity.ERROR: RED, Severity.WARNING: YELLOW, Severity.INFO: BLUE}
+    STATUS = {'PASS': GREEN, 'WARN': YELLOW, 'FAIL': RED}
+
     @classmethod
     def disable(cls):
         """Disable colors for non-terminal output."""
@@ -70,11 +99,16 @@ class Colors:
         cls.CYAN = ''
         cls.BOLD = ''
         cls.RESET = ''
+        cls.SEVERITY = dict.fromkeys(cls.SEVERITY, '')
+        cls.STATUS = dict.fromkeys(cls.STATUS, '')
 
 
 class Issue:
     """Represents a diagnostic issue found in the document."""
 
+    # Documents can produce many issues; slots avoid a __dict__ per instance
+    __slots__ = ('severity', 'category', 'message', 'location', 'context', 'suggestion')
+
     def __init__(
         self,
         severity: str,
@@ -108,11 +142,7 @@ class Issue:
 
     def format(self, verbose: bool = False) -> str:
         """Format issue for console output."""
-        color = {
-            Severity.ERROR: Colors.RED,
-            Severity.WARNING: Colors.YELLOW,
-            Severity.INFO: Colors.BLUE,
-        }.get(self.severity, '')
+        color = Colors.SEVERITY.get(self.severity, '')
 
         lines = [f"{color}[{self.severity}]{Colors.RESET} {Colors.BOLD}{self.category}{Colors.RESET}: {self.message}"]
 
@@ -130,6 +160,43 @@ class Issue:
         return '\n'.join(lines)
 
 
+class MappedFile(mmap.mmap):
+    """A read-only memory map that zipfile can treat as a seekable file.
+
+    mmap has read, seek and tell, but seekable() only from Python 3.13, and
+    it rejects a seek before the start with ValueError where files raise
+    OSError, which zipfile relies on to tell a file too short to be a ZIP.
+    """
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        try:
+            super().seek(pos, whence)
+        except ValueError as e:
+            raise OSError(str(e)) from None
+        return self.tell()
+
+
+class ElementTally:
+    """What the document.xml checks need to know, gathered element by element.
+
+    Filled from a parsed tree or from iterparse events, so the tree and
+    streaming modes share the same bookkeeping and the same checks.
+    """
+
+    def __init__(self, counted_tags: Tuple[str, ...]):
+        self.counts: Dict[str, int] = dict.fromkeys(counted_tags, 0)
+        # Every distinct tag, in order of first appearance
+        self.tags: Dict[str, None] = {}
+        self.nested_deletions = False
+        self.locked_content_controls = 0
+        # Field type labels, in order of first appearance
+        self.field_types: Dict[str, None] = {}
+        self.broken_hyperlinks = 0
+
+
 class DocxDiagnostic:
     """Main diagnostic class for analyzing DOCX files."""
 
@@ -149,12 +216,104 @@ class DocxDiagnostic:
         (0xFFFE, 0xFFFF),  # Non-characters
     ]
 
-    def __init__(self, filepath: str, verbose: bool = False):
+    # Character class matching any code point in INVALID_CHAR_RANGES
+    _INVALID_CHAR_RE = re.compile(
+        '[' + ''.join(f'\\u{start:04x}-\\u{end:04x}' for start, end in INVALID_CHAR_RANGES) + ']'
+    )
+
+    # The same ranges in encoded form, for a bulk pre-check on raw bytes:
+    # ASCII control characters are single bytes in UTF-8, the
+    # non-characters are fixed three-byte sequences
+    _INVALID_BYTES = bytes(
+        code for start, end in INVALID_CHAR_RANGES if end < 0x80 for code in range(start, end + 1)
+    )
+    _VALID_BYTES = bytes(range(256)).translate(None, _INVALID_BYTES)
+    _ASCII_BYTES = bytes(range(128))
+    _INVALID_SEQUENCES = tuple(
+        chr(code).encode('utf-8') for start, end in INVALID_CHAR_RANGES if start >= 0x80
+        for code in range(start, end + 1)
+    )
+
+    # Field instruction keywords, one named group per field type. The type is
+    # the first word of an instruction, so the leftmost match classifies it.
+    _FIELD_TYPE_RE = re.compile(
+        r'\b(?:(?P<toc>TOC)'
+        r'|(?P<ref>(?:PAGE|STYLE|NOTE)?REF)'
+        r'|(?P<hyperlink>HYPERLINK)'
+        r'|(?P<merge>MERGEFIELD)'
+        r'|(?P<page>(?:NUM)?PAGES?)'
+        r'|(?P<datetime>(?:CREATE|SAVE|PRINT)?DATE|TIME))\b',
+        re.IGNORECASE
+    )
+    _FIELD_TYPE_LABELS = {
+        'toc': 'Table of Contents',
+        'ref': 'Cross-reference',
+        'hyperlink': 'Hyperlink',
+        'merge': 'Mail Merge',
+        'page': 'Page Number',
+        'datetime': 'Date/Time',
+    }
+
+    # Invalid characters reported individually in verbose mode
+    _INVALID_CHAR_DETAILS = 5
+
+    # Distinct invalid characters listed in the issue summary
+    _INVALID_CHAR_SUMMARY = 10
+
+    # Namespaces are only reported, so collecting stops after this many
+    _MAX_NAMESPACES = 64
+    _KNOWN_NAMESPACES = frozenset(NAMESPACES.values())
+
+    # w:lock values that stop a content control from being edited
+    _LOCKED_SDT_VALUES = frozenset(('sdtLocked', 'contentLocked', 'sdtContentLocked'))
+
+    # document.xml is decompressed and parsed in pieces of this size
+    _READ_CHUNK_SIZE = 64 * 1024
+
+    # document.xml parts larger than this (uncompressed) are analyzed in
+    # streaming mode even without --streaming
+    STREAMING_THRESHOLD = 20 * 1024 * 1024
+
+    # Elements counted by the walk over document.xml
+    _COUNTED_TAGS = (
+        INS_TAG, DEL_TAG, PPR_CHANGE_TAG, RPR_CHANGE_TAG,
+        SMART_TAG_TAG, SDT_TAG, FLD_CHAR_TAG, INSTR_TEXT_TAG,
+        HYPERLINK_TAG, OMATH_TAG, OMATH_PARA_TAG,
+    )
+
+    def __init__(
+        self,
+        filepath: str,
+        verbose: bool = False,
+        streaming: bool = False,
+        deep: bool = False
+    ):
         self.filepath = filepath
         self.verbose = verbose
+        self.streaming = streaming
+        self.deep = deep
         self.issues: List[Issue] = []
         self.stats: Dict[str, Any] = {}
         self.zip_file: Optional[zipfile.ZipFile] = None
+        self._mapped_file: Optional[MappedFile] = None
+        # Archive member names, read once from the central directory
+        self._namelist: List[str] = []
+        self._nameset: FrozenSet[str] = frozenset()
+
+    def __enter__(self) -> 'DocxDiagnostic':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the archive, which every check reads from, if still open."""
+        if self.zip_file:
+            self.zip_file.close()
+            self.zip_file = None
+        if self._mapped_file is not None:
+            self._mapped_file.close()
+            self._mapped_file = None
 
     def add_issue(
         self,
@@ -170,8 +329,6 @@ class DocxDiagnostic:
 
     def run_all_checks(self) -> bool:
         """Run all diagnostic checks. Returns True if document appears valid."""
-        print(f"\n{Colors.BOLD}Analyzing: {self.filepath}{Colors.RESET}\n")
-
         # Check 1: File exists and is accessible
         if not self._check_file_exists():
             return False
@@ -193,8 +350,7 @@ class DocxDiagnostic:
         self._check_embedded_objects()
 
         # Close ZIP file
-        if self.zip_file:
-            self.zip_file.close()
+        self.close()
 
         return len([i for i in self.issues if i.severity == Severity.ERROR]) == 0
 
@@ -241,10 +397,12 @@ class DocxDiagnostic:
     def _check_zip_structure(self) -> bool:
         """Check if file is a valid ZIP archive."""
         try:
-            self.zip_file = zipfile.ZipFile(self.filepath, 'r')
+            self.zip_file = zipfile.ZipFile(self._map_file(), 'r')
 
-            # Test ZIP integrity
-            bad_file = self.zip_file.testzip()
+            # Test ZIP integrity. testzip() inflates every member, media
+            # included, so it only runs with --deep; the parts the checks
+            # read are still CRC-checked by zipfile as they are read.
+            bad_file = self.zip_file.testzip() if self.deep else None
             if bad_file:
                 self.add_issue(
                     Severity.ERROR,
@@ -254,7 +412,9 @@ class DocxDiagnostic:
                 )
                 return False
 
-            self.stats['zip_files'] = len(self.zip_file.namelist())
+            self._namelist = self.zip_file.namelist()
+            self._nameset = frozenset(self._namelist)
+            self.stats['zip_files'] = len(self._namelist)
             return True
 
         except zipfile.BadZipFile as e:
@@ -273,15 +433,26 @@ class DocxDiagnostic:
             )
             return False
 
+    def _map_file(self):
+        """Memory-map the file for zipfile, falling back to the path.
+
+        The central directory scan and member reads then come straight from
+        the page cache rather than through a read() call each.
+        """
+        with open(self.filepath, 'rb') as f:
+            try:
+                self._mapped_file = MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return self.filepath
+        return self._mapped_file
+
     def _check_required_files(self):
         """Check for required files in DOCX structure."""
         if not self.zip_file:
             return
 
-        file_list = self.zip_file.namelist()
-
         for required in self.REQUIRED_FILES:
-            if required not in file_list:
+            if required not in self._nameset:
                 self.add_issue(
                     Severity.ERROR,
                     'DOCX Structure',
@@ -297,7 +468,7 @@ class DocxDiagnostic:
         }
 
         for filepath, message in optional_files.items():
-            if filepath not in file_list:
+            if filepath not in self._nameset:
                 self.add_issue(Severity.INFO, 'DOCX Structure', message, location=filepath)
 
     def _analyze_document_xml(self):
@@ -306,32 +477,36 @@ class DocxDiagnostic:
             return
 
         try:
-            with self.zip_file.open('word/document.xml') as f:
-                content = f.read()
+            info = self.zip_file.getinfo('word/document.xml')
+            streaming = self.streaming or info.file_size > self.STREAMING_THRESHOLD
 
-            # Check for invalid characters in raw content
-            self._check_invalid_characters(content, 'word/document.xml')
+            with self.zip_file.open(info) as f:
+                tally, parse_error, suspect = self._parse_document_stream(f, streaming)
 
-            # Parse XML
-            try:
-                root = ET.fromstring(content)
-            except ET.ParseError as e:
+            # Check for invalid characters in raw content. The streamed
+            # pre-check only says whether there may be any; re-read the part
+            # to locate them in the rare case there are.
+            if suspect:
+                with self.zip_file.open(info) as f:
+                    self._check_invalid_characters(f.read(), 'word/document.xml')
+
+            if parse_error is not None:
                 self.add_issue(
                     Severity.ERROR,
                     'XML Parsing',
-                    f'Failed to parse document.xml: {str(e)}',
+                    f'Failed to parse document.xml: {str(parse_error)}',
                     suggestion='Document XML is malformed. Check for invalid characters or corrupted content.'
                 )
                 return
 
             # Run element-specific checks
-            self._check_tracked_changes(root)
-            self._check_smart_tags(root)
-            self._check_content_controls(root)
-            self._check_field_codes(root)
-            self._check_equations(root)
-            self._check_hyperlinks(root)
-            self._check_namespaces(root)
+            self._check_tracked_changes(tally)
+            self._check_smart_tags(tally)
+            self._check_content_controls(tally)
+            self._check_field_codes(tally)
+            self._check_equations(tally)
+            self._check_hyperlinks(tally)
+            self._check_namespaces(list(tally.tags))
 
         except KeyError:
             self.add_issue(
@@ -346,6 +521,126 @@ class DocxDiagnostic:
                 f'Error analyzing document.xml: {str(e)}'
             )
 
+    def _parse_document_stream(
+        self, f, streaming: bool
+    ) -> Tuple[Optional[ElementTally], Optional[ET.ParseError], bool]:
+        """Parse document.xml from its member stream, chunk by chunk.
+
+        Each chunk is fed to the parser and pre-checked for invalid UTF-8 or
+        invalid characters as it is read, so the decompressed part is never
+        held in memory alongside its tree. In streaming mode no tree is kept
+        either: elements are tallied as they complete and discarded.
+
+        Returns the element tally (None if parsing failed), the parse error,
+        and whether the content needs the full invalid-character check.
+        """
+        if streaming:
+            parser = ET.XMLPullParser(events=('start', 'end'))
+            feed = self._streaming_feeder(parser, ElementTally(self._COUNTED_TAGS))
+        else:
+            parser = ET.XMLParser()
+            feed = parser.feed
+
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parse_error = None
+        suspect = False
+        tail = b''
+
+        while True:
+            chunk = f.read(self._READ_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            if parse_error is None:
+                try:
+                    feed(chunk)
+                except ET.ParseError as e:
+                    parse_error = e
+
+            if not suspect:
+                suspect = self._chunk_may_be_invalid(decoder, tail, chunk)
+                tail = (tail + chunk)[-2:]
+            elif parse_error is not None:
+                # Nothing left to learn from the rest of the part
+                break
+
+        if not suspect:
+            try:
+                decoder.decode(b'', final=True)
+            except UnicodeDecodeError:
+                suspect = True
+
+        tally = None
+        if parse_error is None:
+            try:
+                if streaming:
+                    # Closing flushes any final events through the feeder
+                    parser.close()
+                    tally = feed(b'')
+                else:
+                    tally = self._tally_tree(parser.close())
+            except ET.ParseError as e:
+                parse_error = e
+
+        return tally, parse_error, suspect
+
+    def _streaming_feeder(self, parser: ET.XMLPullParser, tally: ElementTally):
+        """Return a feed function that tallies elements as they complete.
+
+        Children of w:body are discarded once fully parsed, so memory is
+        bounded by the largest top-level block (paragraph, table, ...). Every
+        element is still complete when tallied, so checks that look inside
+        an element (nested deletions, content control locks) see the same
+        subtree as in tree mode. The function returns the tally.
+        """
+        seen_tags = tally.tags
+        depth = 0
+        body = None
+
+        def feed(chunk: bytes) -> ElementTally:
+            nonlocal depth, body
+            if chunk:
+                parser.feed(chunk)
+
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    depth += 1
+                    if depth == 2:
+                        body = elem
+                    seen_tags[elem.tag] = None
+                    continue
+
+                depth -= 1
+                self._tally_element(elem, tally)
+                if depth == 2 and body is not None:
+                    body.clear()
+
+            return tally
+
+        return feed
+
+    def _chunk_may_be_invalid(self, decoder: codecs.IncrementalDecoder, tail: bytes, chunk: bytes) -> bool:
+        """Cheaply check one chunk for invalid UTF-8 or invalid XML characters.
+
+        tail holds the last two bytes read before this chunk, so encoded
+        non-characters split across the boundary are still caught.
+        """
+        # Pure-ASCII chunks are valid UTF-8 as long as no multi-byte
+        # sequence is left open from the previous chunk, so skip decoding
+        # them; the decoded text itself is never needed here. Deleting the
+        # ASCII bytes stands in for bytes.isascii(), which needs Python 3.7.
+        if chunk.translate(None, self._ASCII_BYTES) or decoder.getstate()[0]:
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                return True
+
+        if chunk.translate(None, self._VALID_BYTES):
+            return True
+
+        boundary = tail + chunk[:2]
+        return any(seq in chunk or seq in boundary for seq in self._INVALID_SEQUENCES)
+
     def _check_invalid_characters(self, content: bytes, filename: str):
         """Check for invalid XML characters in content."""
         try:
@@ -360,72 +655,137 @@ class DocxDiagnostic:
             )
             return
 
-        invalid_found = []
+        # Most documents are clean. Deleting every valid byte leaves nothing
+        # unless a control character is present, which is far cheaper than
+        # scanning the decoded text, so the full scan only runs when needed.
+        if not content.translate(None, self._VALID_BYTES) and not any(
+            seq in content for seq in self._INVALID_SEQUENCES
+        ):
+            return
+
+        # The regex scan runs in C; Python only sees the (rare) matches
+        found = self._INVALID_CHAR_RE.findall(text)
+        if not found:
+            return
 
-        for i, char in enumerate(text):
-            code = ord(char)
-            for start, end in self.INVALID_CHAR_RANGES:
-                if start <= code <= end:
-                    # Get surrounding context
-                    ctx_start = max(0, i - 20)
-                    ctx_end = min(len(text), i + 20)
-                    context = text[ctx_start:ctx_end].replace('\n', '\\n').replace('\r', '\\r')
+        # Group by character type, listing only the most frequent ones
+        char_counts = Counter(found)
+        summary = ', '.join([
+            f"{hex(ord(char))}: {count}x"
+            for char, count in char_counts.most_common(self._INVALID_CHAR_SUMMARY)
+        ])
+
+        # Only the first few occurrences are reported in detail, so
+        # positions, lines and contexts are worked out for those alone
+        positions: List[int] = []
+        lines: List[int] = []
+        contexts: List[str] = []
+        line_num = 1
+        line_counted_to = 0
+        for match in islice(self._INVALID_CHAR_RE.finditer(text), self._INVALID_CHAR_DETAILS):
+            i = match.start()
+
+            # Get surrounding context
+            ctx_start = max(0, i - 20)
+            ctx_end = min(len(text), i + 20)
+            contexts.append(text[ctx_start:ctx_end].replace('\n', '\\n').replace('\r', '\\r'))
+
+            # Find line number, counting only the newlines since the last match
+            line_num += text.count('\n', line_counted_to, i)
+            line_counted_to = i
+            lines.append(line_num)
+            positions.append(i)
+
+        self.add_issue(
+            Severity.ERROR,
+            'Invalid Characters',
+            f'Found {len(found)} invalid XML character(s) in {filename}',
+            location=f'Characters found: {summary}',
+            context=contexts[0],
+            suggestion='Remove control characters. These often come from copy/paste operations.'
+        )
+
+        # Add detailed info for first few occurrences in verbose mode
+        if self.verbose:
+            for char, position, line, context in zip(found, positions, lines, contexts):
+                self.add_issue(
+                    Severity.INFO,
+                    'Invalid Character Detail',
+                    f'Character {hex(ord(char))} at line {line}, position {position}',
+                    context=context
+                )
 
-                    # Find line number
-                    line_num = text[:i].count('\n') + 1
+    def _tally_tree(self, root: ET.Element) -> ElementTally:
+        """Tally every element of a parsed tree in one walk."""
+        tally = ElementTally(self._COUNTED_TAGS)
+        seen_tags = tally.tags
 
-                    invalid_found.append({
-                        'char': hex(code),
-                        'position': i,
-                        'line': line_num,
-                        'context': context
-                    })
-                    break
+        for elem in root.iter():
+            seen_tags[elem.tag] = None
+            self._tally_element(elem, tally)
 
-        if invalid_found:
-            # Group by character type
-            char_counts = defaultdict(int)
-            for item in invalid_found:
-                char_counts[item['char']] += 1
+        return tally
 
-            summary = ', '.join([f"{char}: {count}x" for char, count in char_counts.items()])
+    def _tally_element(self, elem: ET.Element, tally: ElementTally):
+        """Count one complete element and record anything the checks need from it."""
+        tag = elem.tag
+        count = tally.counts.get(tag)
+        if count is None:
+            return
 
-            self.add_issue(
-                Severity.ERROR,
-                'Invalid Characters',
-                f'Found {len(invalid_found)} invalid XML character(s) in {filename}',
-                location=f'Characters found: {summary}',
-                context=invalid_found[0]['context'] if invalid_found else None,
-                suggestion='Remove control characters. These often come from copy/paste operations.'
-            )
+        tally.counts[tag] = count + 1
+        handler = self._ELEMENT_HANDLERS.get(tag)
+        if handler is not None:
+            handler(self, elem, tally)
 
-            # Add detailed info for first few occurrences in verbose mode
-            if self.verbose:
-                for item in invalid_found[:5]:
-                    self.add_issue(
-                        Severity.INFO,
-                        'Invalid Character Detail',
-                        f'Character {item["char"]} at line {item["line"]}, position {item["position"]}',
-                        context=item['context']
-                    )
-
-    def _check_tracked_changes(self, root: ET.Element):
-        """Check for tracked changes (revisions)."""
-        w = NAMESPACES['w']
+    def _on_ins(self, ins: ET.Element, tally: ElementTally):
+        if not tally.nested_deletions and next(ins.iter(DEL_TAG), None) is not None:
+            tally.nested_deletions = True
 
+    def _on_sdt(self, sdt: ET.Element, tally: ElementTally):
+        # Two direct child lookups are several times cheaper in ElementTree
+        # than one 'sdtPr/lock' path, which goes through ElementPath
+        sdt_pr = sdt.find(SDT_PR_TAG)
+        if sdt_pr is None:
+            return
+        lock = sdt_pr.find(LOCK_TAG)
+        if lock is not None and lock.get(W_VAL_ATTR) in self._LOCKED_SDT_VALUES:
+            tally.locked_content_controls += 1
+
+    def _on_instr_text(self, instr: ET.Element, tally: ElementTally):
+        match = self._FIELD_TYPE_RE.search(instr.text or '')
+        if match:
+            tally.field_types[self._FIELD_TYPE_LABELS[match.lastgroup]] = None
+
+    def _on_hyperlink(self, hl: ET.Element, tally: ElementTally):
+        # Hyperlinks without anchor or relationship ID. Most carry an r:id,
+        # so the anchor lookup is short-circuited away for them.
+        if not (hl.get(R_ID_ATTR) or hl.get(W_ANCHOR_ATTR)):
+            tally.broken_hyperlinks += 1
+
+    # Per-tag work beyond counting, looked up once per counted element
+    _ELEMENT_HANDLERS = {
+        INS_TAG: _on_ins,
+        SDT_TAG: _on_sdt,
+        INSTR_TEXT_TAG: _on_instr_text,
+        HYPERLINK_TAG: _on_hyperlink,
+    }
+
+    def _check_tracked_changes(self, tally: ElementTally):
+        """Check for tracked changes (revisions)."""
         # Count revision elements
-        insertions = root.findall(f'.//{{{w}}}ins')
-        deletions = root.findall(f'.//{{{w}}}del')
-        para_changes = root.findall(f'.//{{{w}}}pPrChange')
-        run_changes = root.findall(f'.//{{{w}}}rPrChange')
+        insertions = tally.counts[INS_TAG]
+        deletions = tally.counts[DEL_TAG]
+        para_changes = tally.counts[PPR_CHANGE_TAG]
+        run_changes = tally.counts[RPR_CHANGE_TAG]
 
-        total_revisions = len(insertions) + len(deletions) + len(para_changes) + len(run_changes)
+        total_revisions = insertions + deletions + para_changes + run_changes
 
         self.stats['tracked_changes'] = {
-            'insertions': len(insertions),
-            'deletions': len(deletions),
-            'paragraph_changes': len(para_changes),
-            'run_changes': len(run_changes),
+            'insertions': insertions,
+            'deletions': deletions,
+            'paragraph_changes': para_changes,
+            'run_changes': run_changes,
             'total': total_revisions
         }
 
@@ -436,59 +796,44 @@ class DocxDiagnostic:
                 severity,
                 'Tracked Changes',
                 f'Document contains {total_revisions} tracked change(s)',
-                location=f'Insertions: {len(insertions)}, Deletions: {len(deletions)}, '
-                         f'Paragraph changes: {len(para_changes)}, Run changes: {len(run_changes)}',
+                location=f'Insertions: {insertions}, Deletions: {deletions}, '
+                         f'Paragraph changes: {para_changes}, Run changes: {run_changes}',
                 suggestion='Accept or reject all tracked changes before processing to avoid issues.'
             )
 
             # Check for nested revisions (complex case)
-            for ins in insertions:
-                nested_del = ins.findall(f'.//{{{w}}}del')
-                if nested_del:
-                    self.add_issue(
-                        Severity.WARNING,
-                        'Nested Revisions',
-                        'Found deletions nested inside insertions (complex revision structure)',
-                        suggestion='This can cause processing issues. Accept all changes in Word first.'
-                    )
-                    break
-
-    def _check_smart_tags(self, root: ET.Element):
-        """Check for deprecated smart tags."""
-        w = NAMESPACES['w']
+            if tally.nested_deletions:
+                self.add_issue(
+                    Severity.WARNING,
+                    'Nested Revisions',
+                    'Found deletions nested inside insertions (complex revision structure)',
+                    suggestion='This can cause processing issues. Accept all changes in Word first.'
+                )
 
-        smart_tags = root.findall(f'.//{{{w}}}smartTag')
+    def _check_smart_tags(self, tally: ElementTally):
+        """Check for deprecated smart tags."""
+        smart_tags = tally.counts[SMART_TAG_TAG]
 
-        self.stats['smart_tags'] = len(smart_tags)
+        self.stats['smart_tags'] = smart_tags
 
         if smart_tags:
             self.add_issue(
                 Severity.WARNING,
                 'Smart Tags',
-                f'Document contains {len(smart_tags)} deprecated smart tag(s)',
+                f'Document contains {smart_tags} deprecated smart tag(s)',
                 suggestion='Smart tags are deprecated and may cause processing issues. '
                            'Open in Word and save to remove them.'
             )
 
-    def _check_content_controls(self, root: ET.Element):
+    def _check_content_controls(self, tally: ElementTally):
         """Check for content controls (SDT elements)."""
-        w = NAMESPACES['w']
+        sdt_count = tally.counts[SDT_TAG]
 
-        sdt_elements = root.findall(f'.//{{{w}}}sdt')
+        self.stats['content_controls'] = sdt_count
 
-        self.stats['content_controls'] = len(sdt_elements)
-
-        if sdt_elements:
+        if sdt_count:
             # Check for locked content controls
-            locked_count = 0
-            for sdt in sdt_elements:
-                sdt_pr = sdt.find(f'{{{w}}}sdtPr')
-                if sdt_pr is not None:
-                    lock = sdt_pr.find(f'{{{w}}}lock')
-                    if lock is not None:
-                        lock_val = lock.get(f'{{{w}}}val', '')
-                        if lock_val in ('sdtLocked', 'contentLocked', 'sdtContentLocked'):
-                            locked_count += 1
+            locked_count = tally.locked_content_controls
 
             if locked_count > 0:
                 self.add_issue(
@@ -501,54 +846,34 @@ class DocxDiagnostic:
                 self.add_issue(
                     Severity.INFO,
                     'Content Controls',
-                    f'Document contains {len(sdt_elements)} content control(s)'
+                    f'Document contains {sdt_count} content control(s)'
                 )
 
-    def _check_field_codes(self, root: ET.Element):
+    def _check_field_codes(self, tally: ElementTally):
         """Check for field codes."""
-        w = NAMESPACES['w']
-
-        field_chars = root.findall(f'.//{{{w}}}fldChar')
-        instr_texts = root.findall(f'.//{{{w}}}instrText')
+        field_chars = tally.counts[FLD_CHAR_TAG]
+        instr_texts = tally.counts[INSTR_TEXT_TAG]
 
-        self.stats['field_codes'] = len(field_chars)
+        self.stats['field_codes'] = field_chars
 
         if field_chars or instr_texts:
-            # Try to identify field types
-            field_types = []
-            for instr in instr_texts:
-                text = instr.text or ''
-                if 'TOC' in text.upper():
-                    field_types.append('Table of Contents')
-                elif 'REF' in text.upper():
-                    field_types.append('Cross-reference')
-                elif 'HYPERLINK' in text.upper():
-                    field_types.append('Hyperlink')
-                elif 'MERGEFIELD' in text.upper():
-                    field_types.append('Mail Merge')
-                elif 'PAGE' in text.upper():
-                    field_types.append('Page Number')
-                elif 'DATE' in text.upper() or 'TIME' in text.upper():
-                    field_types.append('Date/Time')
-
-            unique_types = list(set(field_types))
+            # Field types identified from each instruction, in first-seen order
+            unique_types = list(tally.field_types)
 
             self.add_issue(
                 Severity.INFO,
                 'Field Codes',
-                f'Document contains {len(field_chars)} field code(s)',
+                f'Document contains {field_chars} field code(s)',
                 location=f'Types found: {", ".join(unique_types) if unique_types else "Unknown"}',
                 suggestion='Field codes may need to be updated or unlinked before processing.'
             )
 
-    def _check_equations(self, root: ET.Element):
+    def _check_equations(self, tally: ElementTally):
         """Check for equations (OMML)."""
-        m = NAMESPACES['m']
+        equations = tally.counts[OMATH_TAG]
+        equation_paras = tally.counts[OMATH_PARA_TAG]
 
-        equations = root.findall(f'.//{{{m}}}oMath')
-        equation_paras = root.findall(f'.//{{{m}}}oMathPara')
-
-        total_equations = len(equations) + len(equation_paras)
+        total_equations = equations + equation_paras
         self.stats['equations'] = total_equations
 
         if total_equations > 0:
@@ -560,22 +885,14 @@ class DocxDiagnostic:
                            'Consider converting to images if problems occur.'
             )
 
-    def _check_hyperlinks(self, root: ET.Element):
+    def _check_hyperlinks(self, tally: ElementTally):
         """Check hyperlinks in document."""
-        w = NAMESPACES['w']
-
-        hyperlinks = root.findall(f'.//{{{w}}}hyperlink')
-        self.stats['hyperlinks'] = len(hyperlinks)
+        hyperlinks = tally.counts[HYPERLINK_TAG]
+        self.stats['hyperlinks'] = hyperlinks
 
         if hyperlinks:
             # Check for hyperlinks without anchor or relationship ID
-            broken_count = 0
-            for hl in hyperlinks:
-                r_id = hl.get(f'{{{NAMESPACES["r"]}}}id')
-                anchor = hl.get(f'{{{w}}}anchor')
-
-                if not r_id and not anchor:
-                    broken_count += 1
+            broken_count = tally.broken_hyperlinks
 
             if broken_count > 0:
                 self.add_issue(
@@ -588,25 +905,27 @@ class DocxDiagnostic:
                 self.add_issue(
                     Severity.INFO,
                     'Hyperlinks',
-                    f'Document contains {len(hyperlinks)} hyperlink(s)'
+                    f'Document contains {hyperlinks} hyperlink(s)'
                 )
 
-    def _check_namespaces(self, root: ET.Element):
-        """Check for custom or unusual namespaces."""
-        # Get all namespaces from root element
-        if hasattr(root, 'nsmap'):
-            namespaces = root.nsmap
-        else:
-            # ElementTree doesn't expose nsmap directly, parse from tag
-            namespaces = {}
-            for elem in root.iter():
-                if elem.tag.startswith('{'):
-                    ns = elem.tag[1:elem.tag.index('}')]
-                    if ns not in namespaces.values():
-                        namespaces[f'ns{len(namespaces)}'] = ns
+    def _check_namespaces(self, tags: List[str]):
+        """Check for custom or unusual namespaces.
 
-        known_ns = set(NAMESPACES.values())
-        custom_ns = [ns for ns in namespaces.values() if ns and ns not in known_ns]
+        tags holds each distinct element tag in document order, so namespaces
+        come from a handful of strings rather than another walk of the tree.
+        """
+        # ElementTree doesn't expose nsmap directly, parse from tag. Keyed by
+        # URI so the duplicate test is a hash lookup, in first-seen order.
+        namespaces: Dict[str, None] = {}
+        for tag in tags:
+            if tag.startswith('{'):
+                ns = tag[1:tag.index('}')]
+                if ns not in namespaces:
+                    namespaces[ns] = None
+                    if len(namespaces) >= self._MAX_NAMESPACES:
+                        break
+
+        custom_ns = [ns for ns in namespaces if ns and ns not in self._KNOWN_NAMESPACES]
 
         if custom_ns:
             self.add_issue(
@@ -625,7 +944,7 @@ class DocxDiagnostic:
         try:
             # Check main document relationships
             rels_path = 'word/_rels/document.xml.rels'
-            if rels_path not in self.zip_file.namelist():
+            if rels_path not in self._nameset:
                 self.add_issue(
                     Severity.WARNING,
                     'Relationships',
@@ -634,13 +953,11 @@ class DocxDiagnostic:
                 )
                 return
 
+            # Parsed straight from the member stream, so inflating and the
+            # C expat parser overlap and no copy of the raw XML is kept
             with self.zip_file.open(rels_path) as f:
-                content = f.read()
-
-            root = ET.fromstring(content)
-            rel_ns = 'http://schemas.openxmlformats.org/package/2006/relationships'
-
-            relationships = root.findall(f'.//{{{rel_ns}}}Relationship')
+                root = ET.parse(f).getroot()
+            relationships = list(root.iter(RELATIONSHIP_TAG))
             self.stats['relationships'] = len(relationships)
 
             broken_refs = []
@@ -665,17 +982,18 @@ class DocxDiagnostic:
                 # Normalize path
                 target_path = os.path.normpath(target_path).replace('\\', '/')
 
-                if target_path not in self.zip_file.namelist():
+                if target_path not in self._nameset:
                     # Some references may use different paths
                     alt_path = target.lstrip('./')
-                    if alt_path not in self.zip_file.namelist():
+                    if alt_path not in self._nameset:
                         broken_refs.append({
                             'target': target,
                             'type': rel_type.split('/')[-1] if rel_type else 'unknown'
                         })
 
             if broken_refs:
-                types = list(set([r['type'] for r in broken_refs]))
+                # Distinct types, in the order they were found
+                types = list(dict.fromkeys(r['type'] for r in broken_refs))
                 self.add_issue(
                     Severity.WARNING,
                     'Broken References',
@@ -710,35 +1028,37 @@ class DocxDiagnostic:
         if not self.zip_file:
             return
 
-        file_list = self.zip_file.namelist()
+        # Categorize archive members in one pass over the name list
+        embeddings = ole_objects = media = 0
+        for name in self._namelist:
+            if name.startswith('word/embeddings/'):
+                embeddings += 1
+                if name.endswith('.bin'):
+                    ole_objects += 1
+            elif name.startswith('word/media/'):
+                media += 1
 
         # Check for embeddings folder
-        embeddings = [f for f in file_list if f.startswith('word/embeddings/')]
-        self.stats['embedded_objects'] = len(embeddings)
+        self.stats['embedded_objects'] = embeddings
 
         if embeddings:
-            # Categorize by type
-            ole_objects = [f for f in embeddings if f.endswith('.bin')]
-            other_objects = [f for f in embeddings if not f.endswith('.bin')]
-
             self.add_issue(
                 Severity.WARNING,
                 'Embedded Objects',
-                f'Document contains {len(embeddings)} embedded object(s)',
-                location=f'OLE objects: {len(ole_objects)}, Other: {len(other_objects)}',
+                f'Document contains {embeddings} embedded object(s)',
+                location=f'OLE objects: {ole_objects}, Other: {embeddings - ole_objects}',
                 suggestion='Embedded OLE objects (Excel, PDF, etc.) may cause processing issues. '
                            'Consider removing or converting them.'
             )
 
         # Check for media folder
-        media = [f for f in file_list if f.startswith('word/media/')]
-        self.stats['media_files'] = len(media)
+        self.stats['media_files'] = media
 
         if media:
             self.add_issue(
                 Severity.INFO,
                 'Media Files',
-                f'Document contains {len(media)} media file(s) (images, etc.)'
+                f'Document contains {media} media file(s) (images, etc.)'
             )
 
     def get_summary(self) -> Dict[str, Any]:
@@ -781,11 +1101,7 @@ class DocxDiagnostic:
         summary = self.get_summary()
         print(f"\n{Colors.BOLD}{'=' * 60}{Colors.RESET}")
 
-        status_color = {
-            'PASS': Colors.GREEN,
-            'WARN': Colors.YELLOW,
-            'FAIL': Colors.RED
-        }.get(summary['status'], '')
+        status_color = Colors.STATUS.get(summary['status'], '')
 
         print(f"Status: {status_color}{Colors.BOLD}{summary['status']}{Colors.RESET}")
         print(f"Errors: {Colors.RED}{summary['errors']}{Colors.RESET}")
@@ -815,6 +1131,65 @@ class DocxDiagnostic:
         print(f"{Colors.BOLD}{'=' * 60}{Colors.RESET}\n")
 
 
+# Arguments with these characters are expanded here, for shells that don't
+_HAS_WILDCARD = re.compile(r'[*?]').search
+
+
+def _expand_wildcard(pattern: str) -> Iterator[str]:
+    """Yield the files matching a wildcard argument.
+
+    The usual case, a wildcard in the file name only, lists the directory
+    once with os.scandir, whose entries know their type without a stat per
+    name, and skips directories. Wildcards in directory parts are left to
+    glob.
+    """
+    directory, name = os.path.split(pattern)
+    if _HAS_WILDCARD(directory):
+        yield from glob.iglob(pattern)
+        return
+
+    # Like glob, a wildcard doesn't match hidden files unless asked to
+    include_hidden = name.startswith('.')
+    try:
+        with os.scandir(directory or os.curdir) as entries:
+            names = [
+                entry.name for entry in entries
+                if (include_hidden or not entry.name.startswith('.')) and entry.is_file()
+            ]
+    except OSError:
+        return
+
+    for match in fnmatch.filter(names, name):
+        yield os.path.join(directory, match)
+
+
+def _analyze_file(filepath: str, options: Dict[str, bool], as_json: bool,
+                  color: bool) -> Tuple[bool, Any]:
+    """Run all checks on one file and return (passed, summary or report text).
+
+    A top-level function so worker processes can call it. Only the JSON
+    summary or the rendered report crosses back to the parent, so reports
+    are formatted in the workers and the parent just writes them out.
+    """
+    # Spawned workers re-import the module with colors enabled; forked ones
+    # inherit the parent's choice and have nothing to do
+    if not color and Colors.RESET:
+        Colors.disable()
+
+    # Early exits from the checks can leave the archive open
+    with DocxDiagnostic(filepath, **options) as diagnostic:
+        passed = diagnostic.run_all_checks()
+
+    if as_json:
+        return passed, diagnostic.get_summary()
+
+    report = io.StringIO()
+    with redirect_stdout(report):
+        print(f"\n{Colors.BOLD}Analyzing: {filepath}{Colors.RESET}\n")
+        diagnostic.print_report()
+    return passed, report.getvalue()
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -825,12 +1200,19 @@ Examples:
   python docx_diagnostic.py document.docx
   python docx_diagnostic.py document.docx --verbose
   python docx_diagnostic.py document.docx --json
+  python docx_diagnostic.py large.docx --streaming
   python docx_diagnostic.py *.docx --json > report.json
+  python docx_diagnostic.py *.docx --jsonl > report.jsonl
 
 Exit codes:
   0 - All files passed (no errors)
   1 - One or more files had errors
   2 - Invalid arguments or file not found
+
+Integrity:
+  By default only the parts that are analyzed are CRC-checked, as they
+  are read. --deep also decompresses and verifies every other archive
+  member (images, embedded objects), which is slow on media-heavy files.
         """
     )
 
@@ -844,6 +1226,11 @@ Exit codes:
         action='store_true',
         help='Output results as JSON'
     )
+    parser.add_argument(
+        '--jsonl',
+        action='store_true',
+        help='Output one compact JSON summary per line, as each file finishes'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -854,42 +1241,101 @@ Exit codes:
         action='store_true',
         help='Disable colored output'
     )
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Analyze document.xml without building a full tree (lower memory; '
+             'automatic for parts over 20MB)'
+    )
+    parser.add_argument(
+        '--deep',
+        action='store_true',
+        help='Verify the CRC of every archive member, not just the parts analyzed'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of files to analyze in parallel (default: CPU count)'
+    )
 
     args = parser.parse_args()
 
-    # Disable colors if requested or if not outputting to terminal
-    if args.no_color or not sys.stdout.isatty() or args.json:
+    as_json = args.json or args.jsonl
+
+    # Disable colors if requested or if not outputting to terminal. Resolved
+    # once, and the terminal is only probed when nothing else rules color out.
+    color = not (args.no_color or as_json) and sys.stdout.isatty()
+    if not color:
         Colors.disable()
 
-    results = []
     has_errors = False
 
+    # Keyed by path so files matched by overlapping patterns run once
+    files_to_check: Dict[str, None] = {}
     for filepath in args.files:
         # Handle glob patterns on Windows
-        if '*' in filepath or '?' in filepath:
-            import glob
-            expanded = glob.glob(filepath)
-            if not expanded:
+        if _HAS_WILDCARD(filepath):
+            matched = False
+            for match in _expand_wildcard(filepath):
+                files_to_check[match] = None
+                matched = True
+            if not matched:
                 print(f"Warning: No files match pattern: {filepath}", file=sys.stderr)
-                continue
-            files_to_check = expanded
         else:
-            files_to_check = [filepath]
-
-        for file in files_to_check:
-            diagnostic = DocxDiagnostic(file, verbose=args.verbose)
-            passed = diagnostic.run_all_checks()
-
+            files_to_check[filepath] = None
+
+    options = {'verbose': args.verbose, 'streaming': args.streaming, 'deep': args.deep}
+
+    # Files are independent, so analyze them in worker processes when there
+    # is more than one; reports are still printed in command-line order,
+    # each as soon as it and those before it are done
+    workers = min(args.jobs, len(files_to_check))
+    if workers > 1:
+        # Imported here: it pulls in multiprocessing, which single-file
+        # runs never need
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+        outcomes = executor.map(
+            _analyze_file, files_to_check,
+            repeat(options), repeat(as_json), repeat(color),
+        )
+    else:
+        executor = None
+        outcomes = (
+            _analyze_file(file, options, as_json, color) for file in files_to_check
+        )
+
+    if as_json:
+        import json
+
+    # JSON summaries are written as each file finishes rather than collected
+    # first. A single file is reported as a bare object, several as an
+    # array laid out exactly as json.dumps(..., indent=2) would lay it out.
+    json_array = args.json and not args.jsonl and len(files_to_check) != 1
+    separator = '[\n  '
+    try:
+        for passed, output in outcomes:
             if not passed:
                 has_errors = True
 
-            if args.json:
-                results.append(diagnostic.get_summary())
+            if args.jsonl:
+                sys.stdout.write(json.dumps(output, separators=(',', ':')) + '\n')
+            elif json_array:
+                # Encoded strings never contain raw newlines, so indenting
+                # every line nests the object one level inside the array
+                sys.stdout.write(separator + json.dumps(output, indent=2).replace('\n', '\n  '))
+                separator = ',\n  '
+            elif args.json:
+                print(json.dumps(output, indent=2))
             else:
-                diagnostic.print_report()
+                sys.stdout.write(output)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-    if args.json:
-        print(json.dumps(results if len(results) > 1 else results[0], indent=2))
+    if json_array:
+        print('[]' if separator == '[\n  ' else '\n]')
 
     sys.exit(1 if has_errors else 0)
 
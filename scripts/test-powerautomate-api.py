@@ -7,6 +7,7 @@ Mimics the exact behavior of the Electron app's net.request implementation.
 
 Usage:
     python test-powerautomate-api.py <POWER_AUTOMATE_URL>
+    python test-powerautomate-api.py <POWER_AUTOMATE_URL> --proxy http://proxy:8080
 
     Or set environment variable:
     set POWERAUTOMATE_URL=...
@@ -18,42 +19,324 @@ The script will:
 3. Help diagnose connection issues before building the exe
 """
 
+import argparse
+import base64
+import http.client
 import json
 import sys
 import os
+import socket
 import ssl
-import urllib.request
 import urllib.error
+import urllib.request
 import time
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from urllib.parse import unquote, urlsplit
+
+
+# Response bodies are read in chunks of this size, and no further than
+# MAX_BODY_BYTES, so a huge reply cannot exhaust memory
+READ_CHUNK_SIZE = 64 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# Characters of a response body shown in the log
+PREVIEW_CHARS = 500
+
+
+@lru_cache(maxsize=8)
+def separator(char="=", length=70):
+    """Return a separator line, newline included, built once per style."""
+    return char * length + "\n"
+
+
+# Test payload matching the exact schema expected by Power Automate
+TEST_PAYLOAD = {
+    "Lookup_ID": ["TEST-ID-001", "TSRC-ABC-123456"],
+    "Hyperlinks_Checked": 2,
+    "Total_Hyperlinks": 5,
+    "First_Name": "Test",
+    "Last_Name": "User",
+    "Email": "test.user@example.com",
+}
+
+# Encoded once, compact like JSON.stringify in the Electron app
+PAYLOAD_BYTES = json.dumps(TEST_PAYLOAD, separators=(",", ":")).encode("utf-8")
+
+# Headers matching exactly what Electron app sends, with the body length
+# known up front so it is never sent chunked
+HEADERS = MappingProxyType(
+    {
+        "Content-Type": "application/json; charset=utf-8",
+        "User-Agent": "DocHub/1.0",
+        "Accept": "application/json",
+        "Content-Length": str(len(PAYLOAD_BYTES)),
+    }
+)
 
 
 def print_separator(char="=", length=70):
     """Print a separator line."""
-    print(char * length)
+    sys.stdout.write(separator(char, length))
 
 
 def print_header(title):
     """Print a section header."""
-    print_separator()
-    print(f"  {title}")
-    print_separator()
+    line = separator()
+    sys.stdout.write(f"{line}  {title}\n{line}")
+
+
+# Formatted date and time of the last second a timestamp was taken in;
+# log lines mostly land in the same second, so only milliseconds change
+_timestamp_second = None
+_timestamp_prefix = ""
+
+
+def timestamp():
+    """Return the local time as YYYY-MM-DD HH:MM:SS.mmm."""
+    global _timestamp_second, _timestamp_prefix
+    # time.time() rather than time.time_ns(), which needs Python 3.7
+    now = time.time()
+    seconds = int(now)
+    if seconds != _timestamp_second:
+        _timestamp_second = seconds
+        _timestamp_prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+    return f"{_timestamp_prefix}.{int((now - seconds) * 1000):03d}"
 
 
 def log(level, message):
     """Log a message with timestamp and level."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    print(f"[{timestamp}] [{level}] {message}")
+    print(f"[{timestamp()}] [{level}] {message}")
 
 
-def main():
-    # Get API URL from command line or environment
-    api_url = None
+def log_many(level, messages):
+    """Log several messages under one timestamp with a single write."""
+    prefix = f"[{timestamp()}] [{level}] "
+    sys.stdout.write("".join([f"{prefix}{message}\n" for message in messages]))
+
+
+def preview(text, limit=PREVIEW_CHARS):
+    """Return text cut to limit characters, with ... appended if it was cut."""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + "..."
+
+
+def read_body(response, limit=MAX_BODY_BYTES):
+    """Read at most limit bytes of a response body.
+
+    Returns (body, truncated), where truncated is True if more data followed.
+    """
+    body = bytearray()
+    while len(body) < limit:
+        chunk = response.read(min(READ_CHUNK_SIZE, limit - len(body)))
+        if not chunk:
+            return bytes(body), False
+        body += chunk
+    return bytes(body), bool(response.read(1))
+
+
+@lru_cache(maxsize=2)
+def get_ssl_context(verify=False):
+    """Build the SSL context once and reuse it for every connection."""
+    if verify:
+        return ssl.create_default_context()
+
+    # Create SSL context that bypasses certificate verification
+    # This is necessary for corporate proxies like Zscaler. Built directly
+    # rather than from create_default_context(), which would load the system
+    # trust store only for it to go unused.
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+class SocketOptionsMixin:
+    """Set TCP_NODELAY and SO_KEEPALIVE on the socket once connected.
+
+    Without TCP_NODELAY a small POST can sit behind Nagle's algorithm and
+    the server's delayed ACK, which shows up in the measured duration.
+    Newer http.client versions set it themselves; setting it here does not
+    depend on that. SO_KEEPALIVE stops proxies and NAT from silently
+    dropping a connection kept for reuse.
+    """
+
+    SOCKET_OPTIONS = (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE),
+    )
+
+    def connect(self):
+        super().connect()
+        for level, option in self.SOCKET_OPTIONS:
+            try:
+                self.sock.setsockopt(level, option, 1)
+            except OSError:
+                # Not every platform supports every option
+                pass
+
+
+class TunedHTTPConnection(SocketOptionsMixin, http.client.HTTPConnection):
+    pass
+
+
+class TunedHTTPSConnection(SocketOptionsMixin, http.client.HTTPSConnection):
+    pass
+
+
+def default_port(scheme):
+    """Return the standard port for an http or https URL scheme."""
+    return http.client.HTTPS_PORT if scheme == "https" else http.client.HTTP_PORT
+
+
+def select_proxy(api_url):
+    """Return the proxy urlopen would use for api_url, or None.
+
+    Reads the same settings as urllib: the <scheme>_proxy environment
+    variables, or the system settings on Windows and macOS, and skips the
+    proxy for hosts listed in NO_PROXY or the system bypass list.
+    """
+    url = urlsplit(api_url)
+    proxy = urllib.request.getproxies().get(url.scheme)
+    if not proxy or not url.hostname or urllib.request.proxy_bypass(url.hostname):
+        return None
+    return proxy
+
+
+def parse_proxy(proxy):
+    """Split a proxy URL into (scheme, host, port, Proxy-Authorization).
+
+    Accepts host:port or scheme://[user:password@]host[:port]. A missing
+    port defaults to the proxy scheme's standard port, and credentials
+    become a Basic Proxy-Authorization value (None without credentials),
+    as urllib does.
+    """
+    proxy_url = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    if not proxy_url.hostname:
+        raise ValueError(f"no host in proxy URL {proxy_url.scheme}://...")
 
-    if len(sys.argv) > 1:
-        api_url = sys.argv[1]
+    authorization = None
+    if proxy_url.username is not None:
+        credentials = (
+            f"{unquote(proxy_url.username)}:{unquote(proxy_url.password or '')}"
+        )
+        authorization = "Basic " + base64.b64encode(credentials.encode()).decode(
+            "ascii"
+        )
+    port = proxy_url.port or default_port(proxy_url.scheme)
+    return proxy_url.scheme, proxy_url.hostname, port, authorization
+
+
+def describe_proxy(proxy):
+    """Return the proxy as scheme://host:port for logging, without credentials."""
+    scheme, host, port, _ = parse_proxy(proxy)
+    if ":" in host:
+        host = f"[{host}]"
+    return f"{scheme}://{host}:{port}"
+
+
+@lru_cache(maxsize=8)
+def get_connection(scheme, host, port, proxy, timeout, verify=False):
+    """Return a kept-alive connection to host, reused by later requests.
+
+    With a proxy, HTTPS requests are tunnelled through it with CONNECT and
+    plain HTTP requests are sent to it with the full URL as the path. The
+    target port is always passed explicitly, so http.client never has to
+    split a bare IPv6 address on its last colon.
+    """
+    if not proxy:
+        if scheme == "https":
+            return TunedHTTPSConnection(
+                host, port, timeout=timeout, context=get_ssl_context(verify)
+            )
+        return TunedHTTPConnection(host, port, timeout=timeout)
+
+    _, proxy_host, proxy_port, authorization = parse_proxy(proxy)
+    if scheme == "https":
+        connection = TunedHTTPSConnection(
+            proxy_host,
+            proxy_port,
+            timeout=timeout,
+            context=get_ssl_context(verify),
+        )
+        connection.set_tunnel(
+            host,
+            port,
+            headers={"Proxy-Authorization": authorization} if authorization else None,
+        )
+        return connection
+    return TunedHTTPConnection(proxy_host, proxy_port, timeout=timeout)
+
+
+def send(api_url, payload_bytes, headers, proxy=None, timeout=30, verify=False):
+    """POST payload_bytes to api_url and return the response.
+
+    Uses http.client directly, so no handler chain runs per request. Any
+    reply outside 2xx raises HTTPError, and failures to connect or send
+    raise URLError. Redirects are not followed, so a 3xx (such as a proxy
+    or SSO login redirect) is reported as an HTTP error, not a success.
+    """
+    url = urlsplit(api_url)
+    if url.scheme not in ("http", "https") or not url.hostname:
+        raise urllib.error.URLError(f"unsupported URL: {api_url}")
+
+    connection = get_connection(
+        url.scheme,
+        url.hostname,
+        url.port or default_port(url.scheme),
+        proxy,
+        timeout,
+        verify,
+    )
+    if proxy and url.scheme == "http":
+        target = api_url
+        authorization = parse_proxy(proxy)[3]
+        if authorization:
+            headers = {**headers, "Proxy-Authorization": authorization}
     else:
-        api_url = os.environ.get("POWERAUTOMATE_URL")
+        target = (url.path or "/") + (f"?{url.query}" if url.query else "")
+
+    try:
+        connection.request("POST", target, body=payload_bytes, headers=headers)
+    except OSError as err:
+        connection.close()
+        raise urllib.error.URLError(err)
+    response = connection.getresponse()
+
+    if not 200 <= response.status < 300:
+        raise urllib.error.HTTPError(
+            api_url, response.status, response.reason, response.headers, response
+        )
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Test HTTP POST to the Power Automate webhook endpoint"
+    )
+    parser.add_argument(
+        "url",
+        nargs="?",
+        help="Power Automate URL (default: POWERAUTOMATE_URL environment variable)",
+    )
+    parser.add_argument(
+        "--proxy",
+        help="HTTP proxy as host:port or http://[user:password@]host:port "
+        "(default: the system proxy settings urllib uses, such as "
+        "HTTPS_PROXY/HTTP_PROXY, honouring NO_PROXY)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Verify the server certificate (off by default for corporate "
+        "proxies that intercept TLS)",
+    )
+    args = parser.parse_args()
+
+    # Get API URL from command line or environment
+    api_url = args.url or os.environ.get("POWERAUTOMATE_URL")
 
     if not api_url:
         print_header("ERROR: No Power Automate URL provided")
@@ -69,22 +352,12 @@ Usage:
         )
         sys.exit(1)
 
-    # Test payload matching the exact schema expected by Power Automate
-    test_payload = {
-        "Lookup_ID": ["TEST-ID-001", "TSRC-ABC-123456"],
-        "Hyperlinks_Checked": 2,
-        "Total_Hyperlinks": 5,
-        "First_Name": "Test",
-        "Last_Name": "User",
-        "Email": "test.user@example.com",
-    }
-
-    # Headers matching exactly what Electron app sends
-    headers = {
-        "Content-Type": "application/json; charset=utf-8",
-        "User-Agent": "DocHub/1.0",
-        "Accept": "application/json",
-    }
+    # An explicit --proxy always applies; otherwise use the system settings
+    proxy = args.proxy or select_proxy(api_url)
+    try:
+        proxy_label = describe_proxy(proxy) if proxy else None
+    except ValueError as e:
+        parser.error(f"invalid proxy: {e}")
 
     print_header("Power Automate API Test")
     print(f"Timestamp: {datetime.now().isoformat()}")
@@ -92,94 +365,114 @@ Usage:
     print()
 
     print_header("REQUEST DETAILS")
-    log("INFO", f"URL: {api_url}")
-    log("INFO", "Method: POST")
-    log("INFO", "Headers:")
-    for key, value in headers.items():
-        log("INFO", f"  - {key}: {value}")
+    log_many(
+        "INFO",
+        [f"URL: {api_url}", "Method: POST"]
+        + ([f"Proxy: {proxy_label}"] if proxy_label else [])
+        + ["Headers:"]
+        + [f"  - {key}: {value}" for key, value in HEADERS.items()],
+    )
 
-    log("INFO", "Payload:")
-    payload_json = json.dumps(test_payload, indent=2)
-    for line in payload_json.split("\n"):
-        log("INFO", f"  {line}")
+    # The indented form of the payload is only built for the log
+    payload_json = json.dumps(TEST_PAYLOAD, indent=2)
+    log_many("INFO", ["Payload:"] + [f"  {line}" for line in payload_json.split("\n")])
 
     print()
     print_header("SENDING REQUEST")
 
-    # Create SSL context that bypasses certificate verification
-    # This is necessary for corporate proxies like Zscaler
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-
-    log(
-        "INFO",
-        "SSL certificate verification: DISABLED (for corporate proxy compatibility)",
-    )
-
-    # Encode payload
-    payload_bytes = json.dumps(test_payload).encode("utf-8")
-
-    # Create request
-    request = urllib.request.Request(
-        api_url, data=payload_bytes, headers=headers, method="POST"
-    )
+    if args.verify:
+        log("INFO", "SSL certificate verification: ENABLED")
+    else:
+        log(
+            "INFO",
+            "SSL certificate verification: DISABLED (for corporate proxy compatibility)",
+        )
 
     start_time = time.time()
     log("INFO", "Request sent, waiting for response...")
 
     try:
         # Send request
-        with urllib.request.urlopen(
-            request, context=ssl_context, timeout=30
+        with send(
+            api_url,
+            PAYLOAD_BYTES,
+            HEADERS,
+            proxy=proxy,
+            timeout=30,
+            verify=args.verify,
         ) as response:
             end_time = time.time()
             duration_ms = int((end_time - start_time) * 1000)
 
             print()
             print_header("RESPONSE RECEIVED")
-            log("INFO", f"Status Code: {response.status} {response.reason}")
-            log("INFO", f"Duration: {duration_ms}ms")
-            log("INFO", "Response Headers:")
-            for key, value in response.headers.items():
-                log("INFO", f"  - {key}: {value}")
-
-            # Read response body
-            response_body = response.read().decode("utf-8")
-
-            log("INFO", "Response Body (raw):")
-            log(
+            log_many(
                 "INFO",
-                f"  {response_body[:500]}{'...' if len(response_body) > 500 else ''}",
+                [
+                    f"Status Code: {response.status} {response.reason}",
+                    f"Duration: {duration_ms}ms",
+                    "Response Headers:",
+                ]
+                + [f"  - {key}: {value}" for key, value in response.headers.items()],
             )
 
-            # Try to parse as JSON
-            try:
-                response_json = json.loads(response_body)
-                log("INFO", "Response Body (parsed JSON):")
-                for line in json.dumps(response_json, indent=2).split("\n"):
-                    log("INFO", f"  {line}")
-
-                # Check for Results array
-                if "Results" in response_json:
-                    log("INFO", f"Results count: {len(response_json['Results'])}")
-                    for i, result in enumerate(
-                        response_json["Results"][:5]
-                    ):  # Show first 5
-                        log("INFO", f"  Result {i+1}: {result}")
-                    if len(response_json["Results"]) > 5:
-                        log(
+            # Read response body, up to MAX_BODY_BYTES
+            body_bytes, truncated = read_body(response)
+            response_body = body_bytes.decode(
+                "utf-8", errors="replace" if truncated else "strict"
+            )
+
+            log_many("INFO", ["Response Body (raw):", "  " + preview(response_body)])
+
+            # Try to parse as JSON; a truncated body cannot be parsed
+            if truncated:
+                log(
+                    "WARN",
+                    f"Response body exceeds {MAX_BODY_BYTES // (1024 * 1024)} MB; "
+                    "only the start was read and it was not parsed as JSON",
+                )
+            else:
+                try:
+                    response_json = json.loads(response_body)
+                    log_many(
+                        "INFO",
+                        ["Response Body (parsed JSON):"]
+                        + [
+                            f"  {line}"
+                            for line in json.dumps(response_json, indent=2).split("\n")
+                        ],
+                    )
+
+                    # Check for Results array
+                    if "Results" in response_json:
+                        log_many(
                             "INFO",
-                            f"  ... and {len(response_json['Results']) - 5} more",
+                            [f"Results count: {len(response_json['Results'])}"]
+                            + [
+                                f"  Result {i+1}: {result}"
+                                for i, result in enumerate(
+                                    response_json["Results"][:5]
+                                )  # Show first 5
+                            ],
                         )
+                        if len(response_json["Results"]) > 5:
+                            log(
+                                "INFO",
+                                f"  ... and {len(response_json['Results']) - 5} more",
+                            )
 
-            except json.JSONDecodeError:
-                log("WARN", "Response is not valid JSON")
+                except json.JSONDecodeError:
+                    log("WARN", "Response is not valid JSON")
 
             print()
             print_header("SUCCESS")
-            log("INFO", "API call completed successfully!")
-            log("INFO", f"Total duration: {duration_ms}ms")
+            log_many(
+                "INFO",
+                [
+                    "API call completed successfully!",
+                    f"Total duration: {duration_ms}ms",
+                ],
+            )
 
     except urllib.error.HTTPError as e:
         end_time = time.time()
@@ -187,15 +480,20 @@ Usage:
 
         print()
         print_header("HTTP ERROR")
-        log("ERROR", f"HTTP Error: {e.code} {e.reason}")
-        log("ERROR", f"Duration: {duration_ms}ms")
-        log("ERROR", "Response Headers:")
-        for key, value in e.headers.items():
-            log("ERROR", f"  - {key}: {value}")
+        log_many(
+            "ERROR",
+            [
+                f"HTTP Error: {e.code} {e.reason}",
+                f"Duration: {duration_ms}ms",
+                "Response Headers:",
+            ]
+            + [f"  - {key}: {value}" for key, value in e.headers.items()],
+        )
 
         try:
-            error_body = e.read().decode("utf-8")
-            log("ERROR", f"Error Body: {error_body[:500]}")
+            # Only the first PREVIEW_CHARS characters are shown
+            error_body = e.read(READ_CHUNK_SIZE).decode("utf-8", errors="replace")
+            log("ERROR", "Error Body: " + error_body[:PREVIEW_CHARS])
         except:
             log("ERROR", "Could not read error body")
 
@@ -207,24 +505,34 @@ Usage:
 
         print()
         print_header("CONNECTION ERROR")
-        log("ERROR", f"URL Error: {e.reason}")
-        log("ERROR", f"Duration: {duration_ms}ms")
-        log("ERROR", "This could be due to:")
-        log("ERROR", "  - Network connectivity issues")
-        log("ERROR", "  - Corporate proxy blocking the request")
-        log("ERROR", "  - Invalid URL")
-        log("ERROR", "  - SSL/TLS certificate issues")
+        log_many(
+            "ERROR",
+            [
+                f"URL Error: {e.reason}",
+                f"Duration: {duration_ms}ms",
+                "This could be due to:",
+                "  - Network connectivity issues",
+                "  - Corporate proxy blocking the request",
+                "  - Invalid URL",
+                "  - SSL/TLS certificate issues",
+            ],
+        )
 
         sys.exit(1)
 
     except TimeoutError:
         print()
         print_header("TIMEOUT ERROR")
-        log("ERROR", "Request timed out after 30 seconds")
-        log("ERROR", "This could be due to:")
-        log("ERROR", "  - Network connectivity issues")
-        log("ERROR", "  - Corporate proxy blocking the request")
-        log("ERROR", "  - Power Automate flow taking too long")
+        log_many(
+            "ERROR",
+            [
+                "Request timed out after 30 seconds",
+                "This could be due to:",
+                "  - Network connectivity issues",
+                "  - Corporate proxy blocking the request",
+                "  - Power Automate flow taking too long",
+            ],
+        )
 
         sys.exit(1)
 
@@ -234,16 +542,26 @@ Usage:
 
         print()
         print_header("UNEXPECTED ERROR")
-        log("ERROR", f"Error Type: {type(e).__name__}")
-        log("ERROR", f"Error Message: {str(e)}")
-        log("ERROR", f"Duration: {duration_ms}ms")
+        log_many(
+            "ERROR",
+            [
+                f"Error Type: {type(e).__name__}",
+                f"Error Message: {str(e)}",
+                f"Duration: {duration_ms}ms",
+            ],
+        )
 
         import traceback
 
-        log("ERROR", "Stack Trace:")
-        for line in traceback.format_exc().split("\n"):
-            if line.strip():
-                log("ERROR", f"  {line}")
+        log_many(
+            "ERROR",
+            ["Stack Trace:"]
+            + [
+                f"  {line}"
+                for line in traceback.format_exc().splitlines()
+                if line.strip()
+            ],
+        )
 
         sys.exit(1)
 